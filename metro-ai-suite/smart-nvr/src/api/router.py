@@ -1,6 +1,9 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
-from fastapi import APIRouter, Depends, HTTPException, Request
+import hashlib
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from api.endpoints.frigate_api import FrigateService
 from api.endpoints.summarization_api import SummarizationService
@@ -97,6 +100,25 @@ async def get_search_responses(request: Request):
         return {"error": str(e)}
 
 
+@router.get("/rules/all-responses/")
+async def get_all_rule_responses(request: Request):
+    """
+    Fetch summary and search responses for all rules in a single call.
+    """
+    # Each part fails on its own so one service outage only blanks its table
+    try:
+        summaries = await get_all_rule_summaries(request)
+    except Exception as e:
+        summaries = {"error": str(e)}
+
+    try:
+        searches = await get_search_responses(request)
+    except Exception as e:
+        searches = {"error": str(e)}
+
+    return {"summaries": summaries, "searches": searches}
+
+
 class Rule(BaseModel):
     id: str
     label: str
@@ -114,7 +136,13 @@ async def add_rule(rule: Rule, request: Request):
 
 @router.get("/rules/")
 async def list_rules(request: Request):
-    return await redis_store.get_rules(request)
+    rules = await redis_store.get_rules(request)
+    # Redis set order is arbitrary, so hash the rules in a stable order
+    body = json.dumps(sorted(rules, key=lambda r: r.get("id", "")), sort_keys=True)
+    etag = f'"{hashlib.md5(body.encode(), usedforsecurity=False).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(content=rules, headers={"ETag": etag})
 
 
 @router.get("/rules/{rule_id}")
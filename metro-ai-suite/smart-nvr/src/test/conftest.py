@@ -0,0 +1,7 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+import os
+import sys
+
+# The service modules import each other relative to src/ (e.g. `from api.router`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
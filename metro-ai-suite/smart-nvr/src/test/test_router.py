@@ -0,0 +1,78 @@
+# test/test_router.py
+
+import asyncio
+from unittest.mock import patch, AsyncMock, MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.router import router, get_all_rule_responses
+
+RULES = [
+    {"id": "cam1-person-summarize-abcdef12", "camera": "cam1", "label": "person", "action": "summarize"},
+    {"id": "cam2-car-add to search-12345678", "camera": "cam2", "label": "car", "action": "add to search"},
+]
+
+
+def make_client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+# === get_all_rule_responses ===
+@patch("api.router.get_search_responses", new_callable=AsyncMock)
+@patch("api.router.get_all_rule_summaries", new_callable=AsyncMock)
+def test_get_all_rule_responses_success(mock_summaries, mock_searches):
+    mock_summaries.return_value = {"r1": {"s1": {"summary": "done"}}}
+    mock_searches.return_value = {"r2": [{"video_id": "v1", "message": "ok"}]}
+    result = asyncio.run(get_all_rule_responses(MagicMock()))
+    assert result == {
+        "summaries": {"r1": {"s1": {"summary": "done"}}},
+        "searches": {"r2": [{"video_id": "v1", "message": "ok"}]},
+    }
+
+@patch("api.router.get_search_responses", new_callable=AsyncMock)
+@patch("api.router.get_all_rule_summaries", new_callable=AsyncMock)
+def test_get_all_rule_responses_summary_failure(mock_summaries, mock_searches):
+    mock_summaries.side_effect = Exception("Summarization service down")
+    mock_searches.return_value = {"r2": [{"video_id": "v1", "message": "ok"}]}
+    result = asyncio.run(get_all_rule_responses(MagicMock()))
+    assert result["summaries"] == {"error": "Summarization service down"}
+    assert result["searches"] == {"r2": [{"video_id": "v1", "message": "ok"}]}
+
+@patch("api.router.get_search_responses", new_callable=AsyncMock)
+@patch("api.router.get_all_rule_summaries", new_callable=AsyncMock)
+def test_get_all_rule_responses_search_failure(mock_summaries, mock_searches):
+    mock_summaries.return_value = {"r1": {}}
+    mock_searches.side_effect = Exception("Redis unavailable")
+    result = asyncio.run(get_all_rule_responses(MagicMock()))
+    assert result["summaries"] == {"r1": {}}
+    assert result["searches"] == {"error": "Redis unavailable"}
+
+
+# === list_rules (ETag) ===
+@patch("api.router.redis_store.get_rules", new_callable=AsyncMock)
+def test_list_rules_sends_etag(mock_get_rules):
+    mock_get_rules.return_value = RULES
+    response = make_client().get("/rules/")
+    assert response.status_code == 200
+    assert response.json() == RULES
+    assert response.headers.get("ETag")
+
+@patch("api.router.redis_store.get_rules", new_callable=AsyncMock)
+def test_list_rules_not_modified(mock_get_rules):
+    mock_get_rules.return_value = RULES
+    client = make_client()
+    etag = client.get("/rules/").headers["ETag"]
+    response = client.get("/rules/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+@patch("api.router.redis_store.get_rules", new_callable=AsyncMock)
+def test_list_rules_etag_ignores_order(mock_get_rules):
+    client = make_client()
+    mock_get_rules.return_value = RULES
+    first = client.get("/rules/").headers["ETag"]
+    mock_get_rules.return_value = list(reversed(RULES))
+    second = client.get("/rules/").headers["ETag"]
+    assert first == second
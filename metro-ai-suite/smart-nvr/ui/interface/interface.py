@@ -1,8 +1,10 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 import os
+import anyio
+import asyncio
+import functools
 import gradio as gr
-import threading
 import tempfile
 from datetime import datetime, timedelta
 import time
@@ -12,40 +14,84 @@ from services.api_client import (
     fetch_events,
     add_rule,
     fetch_rule_responses,
-    fetch_rules,
+    fetch_rule_bundle,
+    fetch_rules_if_changed,
+    RULES_UNCHANGED,
     delete_rule_by_id,
     fetch_search_responses,
     fetch_summary_status,
+    is_summary_complete,
+    is_summary_pending,
 )
 from services.video_processor import process_video
 from services.event_utils import display_events
 from config import logger
 import json
 
-camera_list = []
-recent_events = []
 # Global state
+camera_list = []
 recent_events = []
-event_update_thread = None
-stop_event_thread = threading.Event()
+camera_data_cache = {}
+
+# camera -> (monotonic fetch time, events) for collapsing repeated event fetches
+event_cache = {}
+EVENT_CACHE_TTL = 5  # seconds
+# Number of event rows sent ahead of the full events table
+EVENT_ROWS_PER_CHUNK = 20
+
+# Status line shown above a summary, keyed by whether the final summary is ready
+SUMMARY_STATUS_LINE = {True: "**Status:** ✅ completed", False: "**Status:** ⏳ pending"}
+
+# wrapper_fn validation messages
+ERR_INVALID_START = "❌ Error: Invalid start time format."
+ERR_FUTURE_START = "❌ Error: Start time cannot be in the future."
+ERR_OLD_START = "❌ Error: Start time must be within the last 24 hours."
+ERR_BAD_DURATION = "❌ Error: Duration must be a number greater than 0 seconds."
+ERR_FUTURE_END = "❌ Error: End time (start + duration) cannot be in the future."
+
+# Delays (seconds) between attempts while the backend is still starting up
+CAMERA_FETCH_BACKOFF = (0.2, 0.5, 1.0, 2.0)
+
+
+def get_camera_data():
+    """Return the camera -> labels mapping, fetched once per process."""
+    global camera_data_cache
+    if camera_data_cache:
+        return camera_data_cache
+
+    camera_data = fetch_cameras()
+    for delay in CAMERA_FETCH_BACKOFF:
+        if camera_data:
+            break
+        logger.info(f"No cameras returned yet, retrying in {delay}s...")
+        time.sleep(delay)
+        camera_data = fetch_cameras()
+
+    camera_data_cache = camera_data
+    return camera_data
 
 
 def initialize_app():
     """Initialize application and fetch initial data."""
     global camera_list
     logger.info("Initializing app and fetching camera list...")
-    camera_list = fetch_cameras()
+    camera_list = get_camera_data()
     return camera_list
 
 
-def stop_event_updates():
-    """Stop any background event polling."""
-    global event_update_thread, stop_event_thread
-    logger.info("Stopping event update thread...")
-    if event_update_thread and event_update_thread.is_alive():
-        stop_event_thread.set()
-        event_update_thread.join(timeout=2)
-        logger.info("Event update thread stopped.")
+def fetch_events_cached(camera, ttl=EVENT_CACHE_TTL):
+    """Fetch events for a camera, reusing a result fetched within the last `ttl` seconds."""
+    now = time.monotonic()
+    cached = event_cache.get(camera)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+    events = fetch_events(camera)
+    # fetch_events returns [] on errors too, so only cache non-empty results
+    if events:
+        event_cache[camera] = (now, events)
+    else:
+        event_cache.pop(camera, None)
+    return events
 
 
 def cleanup_temp_files():
@@ -53,146 +99,48 @@ def cleanup_temp_files():
     logger.info("Cleaning up temp .mp4 files...")
     try:
         temp_dir = tempfile.gettempdir()
-        for file in os.listdir(temp_dir):
-            if file.endswith(".mp4"):
-                full_path = os.path.join(temp_dir, file)
-                age = time.time() - os.path.getmtime(full_path)
-                if age > 3600:
-                    os.remove(full_path)
-                    logger.info(f"Deleted: {full_path}")
+        cutoff = time.time() - 3600
+        with os.scandir(temp_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".mp4"):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        logger.info(f"Deleted: {entry.path}")
+                except OSError:
+                    # File vanished or is not removable; skip it
+                    continue
     except Exception as e:
         logger.error(f"Failed to clean temp files: {e}")
 
 
-def render_rule_rows(rules, response_output):
-    """Render rows of rules with delete buttons."""
-    with gr.Column() as rule_column:
-        for rule in rules:
-            rule_id_state = gr.State(rule["id"])  # Hold rule ID as state
-
-            with gr.Row():
-                gr.Textbox(
-                    value=rule["id"], label="ID", interactive=False, show_label=False
-                )
-                gr.Textbox(
-                    value=rule.get("camera", ""),
-                    label="Camera",
-                    interactive=False,
-                    show_label=False,
-                )
-                gr.Textbox(
-                    value=rule.get("label", ""),
-                    label="Label",
-                    interactive=False,
-                    show_label=False,
-                )
-                gr.Textbox(
-                    value=rule.get("action", ""),
-                    label="Action",
-                    interactive=False,
-                    show_label=False,
-                )
-
-                delete_btn = gr.Button("❌ Delete")
-                delete_btn.click(
-                    fn=delete_rule_by_id,
-                    inputs=[rule_id_state],  # 👈 Pass the rule ID
-                    outputs=[response_output],
-                )
-    return rule_column
-
-
-polling_threads = {}
-
-
-def poll_summary_status(summary_id, status_output, stop_event):
-    while not stop_event.is_set():
-        try:
-            raw_response = fetch_summary_status(summary_id)
-            logger.info(f"raw_response : {raw_response}")
-            if isinstance(raw_response, str):
-                if not raw_response.strip():
-                    logger.warning(f"Empty response for summary_id={summary_id}")
-                    raise ValueError(
-                        "Empty response received from fetch_summary_status."
-                    )
-                logger.info(f"raw_response : {raw_response}")
-                response = json.loads(raw_response)
-            elif isinstance(raw_response, dict):
-                response = raw_response
-            else:
-                raise ValueError(f"Invalid response type: {type(raw_response)}")
-
-            status = response.get("status", "unknown")
-            logger.info(f"Polled summary {summary_id} status: {status}")
-
-            # Format response as markdown
-            markdown_output = f"## Summary Status (Auto-Polling)\n\n"
-            markdown_output += f"**Summary ID:** `{summary_id}`\n\n"
-            for key, value in response.items():
-                if key == "status":
-                    status_emoji = (
-                        "✅"
-                        if value == "completed"
-                        else "❌" if value == "failed" else "⏳"
-                    )
-                    markdown_output += f"**Status:** {status_emoji} {value}\n\n"
-                else:
-                    markdown_output += (
-                        f"**{key.replace('_', ' ').title()}:** {value}\n\n"
-                    )
-
-            # Safely update the status_output (Gradio Markdown)
-            logger.info(f"status_output : {status_output} and markdown_output {markdown_output}")
-            status_output=markdown_output
-
-            if status in ("completed", "failed"):
-                break
-
-        except Exception as e:
-            logger.error(f"Error polling summary status: {e}", exc_info=True)
-            error_markdown = f"## Error\n\n❌ **Error fetching status:** {str(e)}"
-            status_output =error_markdown
-            break
-
-        time.sleep(10)
-
-
 def extract_summary_id(raw_id):
     if not raw_id:
         return None
     if isinstance(raw_id, dict):
-        return list(raw_id.keys())[0]
+        return next(iter(raw_id), None)
     return raw_id
 
 
-def process_and_poll(camera, start, duration, action, status_output):
-    result = process_video(camera, start, duration, action)
-    if action == "Add to Search":
-        return result
-    raw_id = result.get("summary_id")
-    summary_id = extract_summary_id(raw_id)
+def validation_error(message, previous_summary_id):
+    """Build the wrapper_fn outputs for a rejected request."""
+    # Fresh update dicts each time: Gradio mutates them while applying updates
+    return (
+        None,
+        gr.update(value=message, visible=True),
+        gr.update(visible=True),
+        previous_summary_id,
+        gr.update(value=""),
+        False,
+    )
 
-    if result["status"] == "success" and summary_id:
-        if summary_id in polling_threads:
-            polling_threads[summary_id]["stop"].set()
 
-        stop_event = threading.Event()
-        thread = threading.Thread(
-            target=poll_summary_status,
-            args=(summary_id, status_output, stop_event),
-            daemon=True,
-        )
-        thread.start()
-        polling_threads[summary_id] = {"thread": thread, "stop": stop_event}
-
-    return result
 def wrapper_fn(
     camera,
     start,
     duration,
     action,
-    status_output_box,
     previous_summary_id,
 ):
     now = datetime.now()
@@ -204,34 +152,13 @@ def wrapper_fn(
     elif isinstance(start, int):
         start = datetime.fromtimestamp(float(start))
     elif not isinstance(start, datetime):
-        return (
-            None,
-            gr.update(value="❌ Error: Invalid start time format.", visible=True),
-            gr.update(visible=True),
-            previous_summary_id,
-            gr.update(value=""),
-            False
-        )
+        return validation_error(ERR_INVALID_START, previous_summary_id)
 
     # Validate start time
     if start > now:
-        return (
-            None,
-            gr.update(value="❌ Error: Start time cannot be in the future.", visible=True),
-            gr.update(visible=True),
-            previous_summary_id,
-            gr.update(value=""),
-            False
-        )
+        return validation_error(ERR_FUTURE_START, previous_summary_id)
     elif start < min_time:
-        return (
-            None,
-            gr.update(value="❌ Error: Start time must be within the last 24 hours.", visible=True),
-            gr.update(visible=True),
-            previous_summary_id,
-            gr.update(value=""),
-            False
-        )
+        return validation_error(ERR_OLD_START, previous_summary_id)
 
     # Validate duration > 0
     try:
@@ -239,30 +166,19 @@ def wrapper_fn(
         if duration_sec <= 0:
             raise ValueError
     except Exception:
-        return (
-            None,
-            gr.update(value="❌ Error: Duration must be a number greater than 0 seconds.", visible=True),
-            gr.update(visible=True),
-            previous_summary_id,
-            gr.update(value=""),
-            False
-        )
+        return validation_error(ERR_BAD_DURATION, previous_summary_id)
 
     # Validate that end time is not in the future
     end_time = start + timedelta(seconds=duration_sec)
     if end_time > now:
-        return (
-            None,
-            gr.update(value="❌ Error: End time (start + duration) cannot be in the future.", visible=True),
-            gr.update(visible=True),
-            previous_summary_id,
-            gr.update(value=""),
-            False
-        )
-    # Call processing function
-    result_dict = process_and_poll(camera, start, duration, action, status_output_box)
+        return validation_error(ERR_FUTURE_END, previous_summary_id)
+    # Call processing function; status polling is driven by polling_timer,
+    # which polling_enabled_state activates once a summary ID is returned
+    result_dict = process_video(camera, start, duration, action)
 
-    message = result_dict.get("message", json.dumps(result_dict, indent=2))
+    message = result_dict.get("message")
+    if message is None:
+        message = json.dumps(result_dict, indent=2)
 
     if action == "Summarize":
         raw_summary = result_dict.get("summary_id")
@@ -289,19 +205,37 @@ def wrapper_fn(
 # Function to hide toast and close button
 def dismiss_toast():
     return gr.update(visible=False), gr.update(visible=False)
+
+
+@functools.lru_cache(maxsize=64)
+def format_status_key(key):
+    """Turn a response key such as `summary_id` into a bold markdown label."""
+    return f"**{key.replace('_', ' ').title()}:**"
+
+
+def format_summary_status(summary_id, response):
+    """Render a summary status response as markdown."""
+    parts = [
+        "## Summary Status",
+        f"**Summary ID:** `{summary_id}`",
+        SUMMARY_STATUS_LINE[is_summary_complete(response)],
+    ]
+    parts.extend(
+        f"{format_status_key(key)} {value}" for key, value in response.items()
+    )
+    return "\n\n".join(parts)
+
+
 # Function to manually refresh summary status
-def refresh_summary_status(summary_id):
+async def refresh_summary_status(summary_id):
     if not summary_id:
         return "", gr.update(visible=False), gr.update(visible=False)
 
     try:
-        response = fetch_summary_status(summary_id)
+        response = await anyio.to_thread.run_sync(fetch_summary_status, summary_id)
         if isinstance(response, dict):
             # Hide toast and return formatted markdown
-            markdown_output = f"## Summary Status\n\n"
-            markdown_output += f"**Summary ID:** `{summary_id}`\n\n"
-            for key, value in response.items():
-                markdown_output += f"**{key.replace('_', ' ').title()}:** {value}\n\n"
+            markdown_output = format_summary_status(summary_id, response)
             return markdown_output, gr.update(visible=False), gr.update(visible=False)
         else:
             return f"## Summary Status\n\n```json\n{json.dumps(response, indent=2)}\n```", gr.update(visible=False), gr.update(visible=False)
@@ -309,43 +243,41 @@ def refresh_summary_status(summary_id):
     except Exception as e:
         return f"## Error\n\n❌ **Error fetching status:** {str(e)}", gr.update(visible=True), gr.update(visible=True)
 
-def auto_refresh_summary_status(summary_id):
+async def auto_refresh_summary_status(summary_id):
+    """Timer tick handler; the last value keeps or stops the polling timer."""
     if not summary_id:
-        return "", gr.update(visible=False), gr.update(visible=False)
+        return "", gr.update(visible=False), gr.update(visible=False), False
 
     try:
-        response = fetch_summary_status(summary_id)
+        response = await anyio.to_thread.run_sync(fetch_summary_status, summary_id)
+        # Stop polling once the final summary is ready or the status call failed
+        keep_polling = is_summary_pending(response)
         if isinstance(response, dict):
-            markdown_output = f"## Summary Status\n\n"
-            markdown_output += f"**Summary ID:** `{summary_id}`\n\n"
-            for key, value in response.items():
-                markdown_output += f"**{key.replace('_', ' ').title()}:** {value}\n\n"
+            markdown_output = format_summary_status(summary_id, response)
             # Hide toast on success
-            return markdown_output, gr.update(visible=False), gr.update(visible=False)
+            return markdown_output, gr.update(visible=False), gr.update(visible=False), keep_polling
         else:
-            return f"## Summary Status\n\n```json\n{json.dumps(response, indent=2)}\n```", gr.update(visible=False), gr.update(visible=False)
+            return f"## Summary Status\n\n```json\n{json.dumps(response, indent=2)}\n```", gr.update(visible=False), gr.update(visible=False), keep_polling
     except Exception as e:
-        return f"## Error\n\n❌ **Error fetching status:** {str(e)}", f"❌ Error: {str(e)}", gr.update(visible=True)
+        return f"## Error\n\n❌ **Error fetching status:** {str(e)}", f"❌ Error: {str(e)}", gr.update(visible=True), False
 
 def create_ui():
     show_genai_tab = os.getenv("NVR_GENAI", "false").lower() == "true"
-    time.sleep(5)  # Ensure the environment is fully initialized
-    camera_data = fetch_cameras()
+    camera_data = get_camera_data()
     camera_list = list(camera_data.keys())
     recent_events = []
-    def get_labels_for_camera(camera_name):
-        # Dummy example mapping camera to labels
-        camera_to_labels = {
-            "Front Gate": ["person", "car", "dog"],
-            "Backyard": ["cat", "person"],
-        }
-
-        labels = camera_data.get(camera_name, [])
+    # Label dropdown updates never change for the lifetime of the UI
+    label_updates = {
+        name: gr.update(choices=labels, value=None)
+        for name, labels in camera_data.items()
+    }
+    empty_label_update = gr.update(choices=[], value=None)
 
-        return gr.update(choices=labels, value=None)
+    def get_labels_for_camera(camera_name):
+        # Gradio pops keys off update dicts while applying them, so hand out a copy
+        return dict(label_updates.get(camera_name, empty_label_update))
 
-    def format_summary_responses():
-        data = fetch_rule_responses()
+    def summary_response_rows(data):
         rows = []
 
         # Check if the response contains an error (e.g., 502 error wrapped in a dict)
@@ -356,31 +288,50 @@ def create_ui():
 
         for rule_id, summaries in data.items():
             if summaries:
-                for summary_id, message in summaries.items():
-                    rows.append(
-                        [rule_id, summary_id, message.get("summary", "No summary text")]
-                    )
+                rows.extend(
+                    [rule_id, summary_id, message.get("summary", "No summary text")]
+                    for summary_id, message in summaries.items()
+                )
             else:
                 rows.append([rule_id, "", "No summaries available."])
 
         return rows
 
-    def format_search_responses():
-        data = fetch_search_responses()
+    def search_response_row(rule_id, item):
+        video_id = item.get("video_id", "")
+        message = item.get("message", "")
+        if video_id or message:  # Only add if at least one is non-empty
+            return [rule_id, video_id, message]
+        return [rule_id, "", "No event occurred for this rule."]
+
+    def search_response_rows(data):
+        if isinstance(data, dict) and "error" in data:
+            return [["-", "-", "❌ Failed to retrieve search responses"]]
+
         rows = []
         for rule_id, results in data.items():
             if results:
-                for item in results:
-                    video_id = item.get("video_id", "")
-                    message = item.get("message", "")
-                    if video_id or message:  # Only add if at least one is non-empty
-                        rows.append([rule_id, video_id, message])
-                    else:
-                        rows.append([rule_id, "", "No event occurred for this rule."])
+                rows.extend(search_response_row(rule_id, item) for item in results)
             else:
                 rows.append([rule_id, "", "No search results available."])
         return rows
 
+    async def format_summary_responses():
+        data = await anyio.to_thread.run_sync(fetch_rule_responses)
+        return summary_response_rows(data)
+
+    async def format_search_responses():
+        data = await anyio.to_thread.run_sync(fetch_search_responses)
+        return search_response_rows(data)
+
+    async def load_rule_responses():
+        # One round trip for both response tables
+        bundle = await anyio.to_thread.run_sync(fetch_rule_bundle)
+        return (
+            summary_response_rows(bundle.get("summaries", {})),
+            search_response_rows(bundle.get("searches", {})),
+        )
+
     with gr.Blocks() as ui:
         gr.Markdown("## NVR Event Router")
         gr.Markdown(
@@ -441,7 +392,12 @@ def create_ui():
                 polling_timer.tick(
                     fn=auto_refresh_summary_status,
                     inputs=[summary_id_state],
-                    outputs=[status_output, toast_output, close_toast_btn],
+                    outputs=[
+                        status_output,
+                        toast_output,
+                        close_toast_btn,
+                        polling_enabled_state,
+                    ],
                 )
 
                 process_btn.click(
@@ -451,7 +407,6 @@ def create_ui():
                         start_input,
                         duration_input,
                         action_dropdown,
-                        status_output,
                         summary_id_state,
                     ],
                     outputs=[
@@ -525,10 +480,16 @@ def create_ui():
                             """
                             )
                     
-                    def fetch_and_display_events(camera):
+                    async def fetch_and_display_events(camera):
                         nonlocal recent_events
-                        recent_events = fetch_events(camera)
-                        return display_events(recent_events)
+                        recent_events = await anyio.to_thread.run_sync(
+                            fetch_events_cached, camera
+                        )
+                        rows = display_events(recent_events)
+                        # Send the newest events first so long tables paint early
+                        if len(rows) > EVENT_ROWS_PER_CHUNK:
+                            yield rows[:EVENT_ROWS_PER_CHUNK]
+                        yield rows
 
                     cam_dropdown_view.change(
                         fn=fetch_and_display_events,
@@ -543,7 +504,7 @@ def create_ui():
                     )
 
             # Tab 3: Auto-Route Rules
-            with gr.TabItem("Auto-Route Events"):
+            with gr.TabItem("Auto-Route Events") as auto_route_tab:
                 with gr.Row():
                     camera_dropdown = gr.Dropdown(
                         choices=camera_list,
@@ -595,8 +556,8 @@ def create_ui():
 
                 # 🚀 Show alert on rule add
                 # 🔘 Combined logic: show message, sleep, hide
-                def add_rule_with_auto_hide(camera, label, action):
-                    resp = add_rule(camera, label, action)
+                async def add_rule_with_auto_hide(camera, label, action):
+                    resp = await anyio.to_thread.run_sync(add_rule, camera, label, action)
                     message = (
                         resp.get("message") if isinstance(resp, dict) else str(resp)
                     )
@@ -604,8 +565,8 @@ def create_ui():
                     # Show message
                     yield gr.update(value=message, visible=True)
 
-                    # Keep it visible for 5 seconds
-                    time.sleep(3)
+                    # Keep it visible for 3 seconds without holding a worker thread
+                    await asyncio.sleep(3)
 
                     # Hide message
                     yield gr.update(visible=False)
@@ -632,15 +593,24 @@ def create_ui():
                     interactive=False,
                 )
                 refresh_rules_btn = gr.Button("🔄 Refresh Rules")
-
-                def load_rules():
-                    rules = fetch_rules()
-                    return [
+                # Rows currently shown in rules_table, so deletes can patch them locally
+                rules_state = gr.State([])
+                # ETag of the rules currently shown, sent as If-None-Match on refresh
+                rules_etag_state = gr.State(None)
+
+                async def load_rules(etag):
+                    rules, etag = await anyio.to_thread.run_sync(
+                        fetch_rules_if_changed, etag
+                    )
+                    if rules is RULES_UNCHANGED:
+                        return gr.update(), gr.update(), etag
+                    rows = [
                         [r["id"], r["camera"], r["label"], r["action"], "🗑️ Delete"]
                         for r in rules
                     ]
+                    return rows, rows, etag
 
-                def delete_selected_rule(evt: gr.SelectData):
+                async def delete_selected_rule(rows, etag, evt: gr.SelectData):
 
                     if evt.value == "🗑️ Delete":
                         try:
@@ -651,24 +621,40 @@ def create_ui():
                             rule_id = selected_row[0]
 
                             # Delete the rule
-                            result = delete_rule_by_id(rule_id)
-                            return result, load_rules()
+                            result = await anyio.to_thread.run_sync(
+                                delete_rule_by_id, rule_id
+                            )
+                            if result.startswith("✅"):
+                                rows = [row for row in rows if row[0] != rule_id]
+                                # Local rows no longer match the fetched ETag
+                                etag = None
+                            return result, rows, rows, etag
 
                         except Exception as e:
                             logger.error(f"Error deleting rule: {str(e)}")
-                            return f"❌ Error: {str(e)}", load_rules()
+                            return f"❌ Error: {str(e)}", rows, rows, etag
 
-                    return "Click the delete icon (🗑️) to remove a rule", load_rules()
+                    return "Click the delete icon (🗑️) to remove a rule", rows, rows, etag
 
                 # Event handlers
-                refresh_rules_btn.click(fn=load_rules, outputs=[rules_table])
+                refresh_rules_btn.click(
+                    fn=load_rules,
+                    inputs=[rules_etag_state],
+                    outputs=[rules_table, rules_state, rules_etag_state],
+                )
 
                 rules_table.select(
-                    fn=delete_selected_rule, outputs=[delete_status, rules_table]
+                    fn=delete_selected_rule,
+                    inputs=[rules_state, rules_etag_state],
+                    outputs=[delete_status, rules_table, rules_state, rules_etag_state],
                 )
 
                 # Initial load
-                ui.load(fn=load_rules, outputs=[rules_table])
+                ui.load(
+                    fn=load_rules,
+                    inputs=[rules_etag_state],
+                    outputs=[rules_table, rules_state, rules_etag_state],
+                )
                 gr.Markdown("### Rule Responses")
 
                 summary_response_table = gr.Dataframe(
@@ -692,4 +678,10 @@ def create_ui():
                     fn=format_search_responses, outputs=[search_response_table]
                 )
 
+                # 👇 Populate both response tables when the tab is opened
+                auto_route_tab.select(
+                    fn=load_rule_responses,
+                    outputs=[summary_response_table, search_response_table],
+                )
+
     return ui
@@ -5,7 +5,7 @@ from ui.config import API_BASE_URL, logger
 import uuid
 import hashlib
 import requests
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 
 def fetch_cameras() -> Dict[str, List[str]]:
@@ -70,13 +70,31 @@ def add_rule(camera: str, label: str, action: str) -> Dict:
 
 
 def fetch_rules() -> List[dict]:
+    # Unconditional fetch: without an ETag the server never answers 304
+    rules, _ = fetch_rules_if_changed()
+    return [] if rules is RULES_UNCHANGED else rules  # ✅ Return list of rule dicts
+
+
+# Returned by fetch_rules_if_changed when the server reports 304 Not Modified
+RULES_UNCHANGED = object()
+
+
+def fetch_rules_if_changed(etag: Optional[str] = None) -> Tuple[object, Optional[str]]:
+    """
+    Fetch rules unless they match `etag`.
+
+    Returns (rules, etag), with rules set to RULES_UNCHANGED on a 304 response.
+    """
+    headers = {"If-None-Match": etag} if etag else {}
     try:
-        response = requests.get(f"{API_BASE_URL}/rules/")
+        response = requests.get(f"{API_BASE_URL}/rules/", headers=headers)
+        if response.status_code == 304:
+            return RULES_UNCHANGED, etag
         response.raise_for_status()
-        return response.json()  # ✅ Return list of rule dicts
+        return response.json(), response.headers.get("ETag")
     except Exception as e:
         logger.error(f"Error fetching rules: {e}")
-        return []
+        return [], None
 
 
 def fetch_rule_responses() -> Dict:
@@ -90,6 +108,19 @@ def fetch_rule_responses() -> Dict:
         return {"error": str(e)}
 
 
+def fetch_rule_bundle() -> Dict:
+    """
+    Fetch summary and search responses for all rules in one request.
+    """
+    try:
+        response = requests.get(f"{API_BASE_URL}/rules/all-responses/")
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        logger.error(f"Error fetching rule response bundle: {e}")
+        return {"summaries": {"error": str(e)}, "searches": {"error": str(e)}}
+
+
 def delete_rule_by_id(rule_id: str) -> str:
     try:
         response = requests.delete(f"{API_BASE_URL}/rules/{rule_id}")
@@ -127,3 +158,23 @@ def fetch_summary_status(summary_id: str) -> str:
         logger.error(f"Error fetching search responses: {e}")
         return str(e)
 
+
+def is_summary_complete(status: Dict) -> bool:
+    """
+    Return True once a summary-status payload carries the final summary.
+
+    While the summary is pending the backend also returns the per-chunk
+    "frameSummaries"; the finished payload only has "summary".
+    """
+    return "summary" in status and "frameSummaries" not in status
+
+
+def is_summary_pending(status) -> bool:
+    """
+    Return True while a summary-status result is still worth polling.
+
+    fetch_summary_status returns an error string when the request fails
+    (e.g. a 502 from the summarization service or an unknown summary ID),
+    which is treated as final just like a completed summary.
+    """
+    return isinstance(status, dict) and not is_summary_complete(status)
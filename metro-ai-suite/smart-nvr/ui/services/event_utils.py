@@ -5,6 +5,8 @@ from ui.config import logger
 from typing import List, Dict, Optional, Tuple
 import gradio as gr
 
+THUMBNAIL_HTML = '<img src="data:image/jpeg;base64,{}" style="width:80px;height:60px;object-fit:cover;" alt="Event Thumbnail">'
+
 
 def format_timestamp(ts):
     try:
@@ -25,29 +27,26 @@ def display_events(recent_events) -> List[List]:
         try:
             top_score = "NA"
             description = "N/A"
-            if event.get("data") and "description" in event.get("data", {}):
-                top_score = event.get("data", {}).get("top_score", "N/A")
-                description = event.get("data", {}).get("description", "N/A")
+            data = event.get("data")
+            if data and "description" in data:
+                top_score = data.get("top_score", "N/A")
+                description = data.get("description", "N/A")
 
-            # Handle thumbnail data
+            # Handle thumbnail data: the API already sends it base64-encoded,
+            # so it only needs wrapping in an HTML img tag
             thumbnail = event.get("thumbnail", "")
-            if thumbnail:
-                # Create HTML img tag for base64 thumbnail
-                thumbnail_html = f'<img src="data:image/jpeg;base64,{thumbnail}" style="width:80px;height:60px;object-fit:cover;" alt="Event Thumbnail">'
-            else:
-                thumbnail_html = "No Image"
-
-            formatted_row = [
-                str(event.get("label", "N/A")),
-                str(format_timestamp(event.get("start_time"))),
-                str(format_timestamp(event.get("end_time"))),
-                str(top_score),
-                str(description),
-                thumbnail_html,
-            ]
-
-            # Enforce row is a list, not a tuple
-            formatted_events.append(list(formatted_row))
+            thumbnail_html = THUMBNAIL_HTML.format(thumbnail) if thumbnail else "No Image"
+
+            formatted_events.append(
+                [
+                    str(event.get("label", "N/A")),
+                    format_timestamp(event.get("start_time")),
+                    format_timestamp(event.get("end_time")),
+                    str(top_score),
+                    str(description),
+                    thumbnail_html,
+                ]
+            )
         except Exception as e:
             logger.error(f"Error formatting event {event}: {e}")
             continue
@@ -7,10 +7,15 @@ from ui.services.api_client import (
     fetch_events,
     add_rule,
     fetch_rules,
+    fetch_rules_if_changed,
+    RULES_UNCHANGED,
     fetch_rule_responses,
+    fetch_rule_bundle,
     delete_rule_by_id,
     fetch_search_responses,
     fetch_summary_status,
+    is_summary_complete,
+    is_summary_pending,
 )
 
 API_RULE_ID = "cam1-person-summarize-abcdef12"
@@ -88,6 +93,23 @@ def test_fetch_rules_failure(mock_logger, mock_get):
     mock_logger.error.assert_called_once()
 
 
+# === fetch_rules_if_changed ===
+@patch("ui.services.api_client.requests.get")
+def test_fetch_rules_if_changed_modified(mock_get):
+    mock_get.return_value = MagicMock(
+        status_code=200, json=lambda: [{"id": "rule1"}], headers={"ETag": '"abc"'}
+    )
+    assert fetch_rules_if_changed() == ([{"id": "rule1"}], '"abc"')
+
+@patch("ui.services.api_client.requests.get")
+def test_fetch_rules_if_changed_not_modified(mock_get):
+    mock_get.return_value = MagicMock(status_code=304)
+    rules, etag = fetch_rules_if_changed('"abc"')
+    assert rules is RULES_UNCHANGED
+    assert etag == '"abc"'
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+
 # === fetch_rule_responses ===
 @patch("ui.services.api_client.requests.get")
 def test_fetch_rule_responses_success(mock_get):
@@ -102,6 +124,22 @@ def test_fetch_rule_responses_failure(mock_logger, mock_get):
     mock_logger.error.assert_called_once()
 
 
+# === fetch_rule_bundle ===
+@patch("ui.services.api_client.requests.get")
+def test_fetch_rule_bundle_success(mock_get):
+    bundle = {"summaries": {"r1": {}}, "searches": {"r2": []}}
+    mock_get.return_value = MagicMock(status_code=200, json=lambda: bundle)
+    assert fetch_rule_bundle() == bundle
+
+@patch("ui.services.api_client.requests.get", side_effect=Exception("API Down"))
+@patch("ui.services.api_client.logger")
+def test_fetch_rule_bundle_failure(mock_logger, mock_get):
+    result = fetch_rule_bundle()
+    assert "error" in result["summaries"]
+    assert "error" in result["searches"]
+    mock_logger.error.assert_called_once()
+
+
 # === delete_rule_by_id ===
 @patch("ui.services.api_client.requests.delete")
 def test_delete_rule_by_id_success(mock_delete):
@@ -148,3 +186,28 @@ def test_fetch_summary_status_failure(mock_logger, mock_get):
     result = fetch_summary_status(SUMMARY_ID)
     assert "Summary not found" in result
     mock_logger.error.assert_called_once()
+
+
+# === is_summary_complete ===
+def test_is_summary_complete_pending():
+    status = {
+        "summary": "Final summary is being generated please wait for a while.",
+        "frameSummaries": [{"startFrame": 0, "endFrame": 10, "status": "completed"}],
+    }
+    assert is_summary_complete(status) is False
+
+def test_is_summary_complete_done():
+    assert is_summary_complete({"summary": "A car entered the gate."}) is True
+
+
+# === is_summary_pending ===
+def test_is_summary_pending_while_generating():
+    status = {"summary": "Final summary is being generated please wait for a while.", "frameSummaries": []}
+    assert is_summary_pending(status) is True
+
+def test_is_summary_pending_done():
+    assert is_summary_pending({"summary": "A car entered the gate."}) is False
+
+def test_is_summary_pending_error_string():
+    error = "502 Server Error: Bad Gateway for url: http://api/summary-status/summary-id-001"
+    assert is_summary_pending(error) is False